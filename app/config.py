@@ -11,6 +11,12 @@ class Settings(BaseSettings):
     allowlisted_domains: str = os.getenv("ALLOWLISTED_DOMAINS", "")
     server_host: str = os.getenv("SERVER_HOST", "0.0.0.0")
     server_port: int = int(os.getenv("SERVER_PORT", "8000"))
+    # Page fetch limits: stop downloading/parsing once either cap is reached
+    fetch_max_bytes: int = int(os.getenv("FETCH_MAX_BYTES", "1048576"))
+    fetch_max_chars: int = int(os.getenv("FETCH_MAX_CHARS", "4000"))
+    # Bulk ingest archive limits: uncompressed size per PDF member, and PDF members per archive
+    ingest_max_member_bytes: int = int(os.getenv("INGEST_MAX_MEMBER_BYTES", "104857600"))
+    ingest_max_members: int = int(os.getenv("INGEST_MAX_MEMBERS", "10000"))
 
     class Config:
         env_file = ".env"
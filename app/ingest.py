@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import tarfile
+import tempfile
+import uuid
+import zipfile
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Set, BinaryIO
+from pypdf import PdfReader
+from app.config import settings
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+SUPPORTED_SUFFIXES = (".pdf",) + ARCHIVE_SUFFIXES
+# Archive members up to this size stay in memory; larger ones roll over to disk
+MEMBER_SPOOL_BYTES = 8 * 1024 * 1024
+COPY_CHUNK_BYTES = 64 * 1024
+
+
+def read_pdf_text(stream: BinaryIO) -> str:
+    reader = PdfReader(stream)
+    pages_text = []
+    for p in reader.pages:
+        try:
+            pages_text.append(p.extract_text() or "")
+        except Exception:
+            pages_text.append("")
+    return "\n\n".join(pages_text)
+
+
+def parse_metadata(metadata: Optional[str]) -> Dict[str, Any]:
+    meta_obj = {}
+    if metadata:
+        try:
+            meta_obj = json.loads(metadata)
+            if not isinstance(meta_obj, dict):
+                meta_obj = {"meta": metadata}
+        except Exception:
+            meta_obj = {"meta": metadata}
+    return meta_obj
+
+
+def _spool(member: BinaryIO) -> BinaryIO:
+    # Archive member streams only emulate seeking (a backward seek decompresses
+    # again from the start), and PdfReader seeks constantly, so copy each member out.
+    # The copy is capped as well, since archive headers can understate the size.
+    spooled = tempfile.SpooledTemporaryFile(max_size=MEMBER_SPOOL_BYTES)
+    limit = settings.ingest_max_member_bytes
+    copied = 0
+    try:
+        while True:
+            chunk = member.read(COPY_CHUNK_BYTES)
+            if not chunk:
+                break
+            copied += len(chunk)
+            if copied > limit:
+                raise ValueError(f"member is larger than {limit} bytes")
+            spooled.write(chunk)
+    except Exception:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+
+def _too_many_members() -> str:
+    return f"Archive has more than {settings.ingest_max_members} PDF members; the rest were skipped"
+
+
+def _too_large() -> str:
+    return f"Failed to read archive member: member is larger than {settings.ingest_max_member_bytes} bytes"
+
+
+def _iter_zip(fileobj: BinaryIO) -> Iterator[Tuple[str, Optional[BinaryIO], Optional[str]]]:
+    with zipfile.ZipFile(fileobj) as zf:
+        count = 0
+        for info in zf.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                continue
+            count += 1
+            if count > settings.ingest_max_members:
+                yield "", None, _too_many_members()
+                break
+            # Reject oversized members before decompressing anything
+            if info.file_size > settings.ingest_max_member_bytes:
+                yield info.filename, None, _too_large()
+                continue
+            try:
+                # Encrypted members raise RuntimeError, unknown compression NotImplementedError
+                with zf.open(info) as member:
+                    spooled = _spool(member)
+            except Exception as e:
+                yield info.filename, None, f"Failed to read archive member: {e}"
+                continue
+            yield info.filename, spooled, None
+
+
+def _iter_tar(fileobj: BinaryIO) -> Iterator[Tuple[str, Optional[BinaryIO], Optional[str]]]:
+    with tarfile.open(fileobj=fileobj, mode="r:*") as tf:
+        members = iter(tf)
+        count = 0
+        while True:
+            try:
+                info = next(members)
+            except StopIteration:
+                break
+            # A truncated or corrupt archive fails while reading the next header
+            # (EOFError, TarError, ...); keep what was read and stop here
+            except Exception as e:
+                yield "", None, f"Failed to read archive: {e}"
+                break
+            if not info.isfile() or not info.name.lower().endswith(".pdf"):
+                continue
+            count += 1
+            if count > settings.ingest_max_members:
+                yield "", None, _too_many_members()
+                break
+            # Reject oversized members before decompressing anything
+            if info.size > settings.ingest_max_member_bytes:
+                yield info.name, None, _too_large()
+                continue
+            try:
+                member = tf.extractfile(info)
+                if member is None:
+                    continue
+                with member:
+                    spooled = _spool(member)
+            except Exception as e:
+                yield info.name, None, f"Failed to read archive member: {e}"
+                continue
+            yield info.name, spooled, None
+
+
+def iter_upload_pdfs(upload: Any) -> Iterator[Tuple[str, Optional[BinaryIO], Optional[str]]]:
+    """
+    Yield (name, stream, error) for each PDF in an upload: the file itself for a
+    PDF, or each PDF member of a zip/tar archive. Archives are read from the
+    upload's spooled temporary file and members are copied out one at a time.
+    Unreadable members or archives are yielded with stream None and an error.
+    """
+    name = upload.filename or ""
+    lower = name.lower()
+    if not lower.endswith(SUPPORTED_SUFFIXES):
+        yield name, None, "Unsupported file type; expected " + ", ".join(SUPPORTED_SUFFIXES)
+        return
+    upload.file.seek(0)
+    if lower.endswith(".pdf"):
+        yield name, upload.file, None
+        return
+    reader = _iter_zip if lower.endswith(".zip") else _iter_tar
+    try:
+        yield from reader(upload.file)
+    except Exception as e:
+        yield "", None, f"Failed to read archive: {e}"
+
+
+def _unique_doc_id(name: str, used: Set[str]) -> str:
+    # Same-named files (report.pdf in two archives) must not share outcomes or vector ids
+    base = os.path.splitext(name)[0] or str(uuid.uuid4())
+    doc_id = base
+    n = 2
+    while doc_id in used:
+        doc_id = f"{base}-{n}"
+        n += 1
+    used.add(doc_id)
+    return doc_id
+
+
+def ingest_uploads(uploads: Iterable[Any], meta_obj: Dict[str, Any], store: Any) -> Dict[str, Any]:
+    """
+    Bulk-ingest uploaded PDFs and zip/tar archives of PDFs into store
+    (a VectorStore), pooling chunks across documents into full batches.
+    Returns the per-document report and overall documents/sec.
+    """
+    started = time.perf_counter()
+    documents: List[Dict[str, Any]] = []
+    used: Set[str] = set()
+
+    def iter_docs():
+        for upload in uploads:
+            for name, stream, error in iter_upload_pdfs(upload):
+                record = {"doc_id": None, "source": upload.filename, "name": name or upload.filename}
+                documents.append(record)
+                if error is not None:
+                    record["status"] = "failed"
+                    record["error"] = error
+                    continue
+                record["doc_id"] = _unique_doc_id(name, used)
+                try:
+                    text = read_pdf_text(stream)
+                except Exception:
+                    record["status"] = "failed"
+                    record["error"] = "Failed to read PDF file"
+                    continue
+                finally:
+                    if stream is not upload.file:
+                        stream.close()
+                yield {"id": record["doc_id"], "text": text, "metadata": meta_obj}
+
+    outcomes = store.upsert_documents_pooled(iter_docs())
+    for record in documents:
+        if record.get("status") == "failed":
+            continue
+        record.update(outcomes.get(record["doc_id"], {}))
+
+    elapsed = time.perf_counter() - started
+    ingested = 0
+    failed = 0
+    for record in documents:
+        if record.get("status") == "ingested":
+            ingested += 1
+        elif record.get("status") in ("failed", "partial"):
+            failed += 1
+    return {
+        "status": "ingested",
+        "mode": "bulk",
+        "count": ingested,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "docs_per_sec": round(len(documents) / elapsed, 2) if elapsed > 0 else 0.0,
+        "documents": documents,
+    }
@@ -5,12 +5,11 @@ from app.schemas import ResearchRequest, ResearchResponse
 from app.tools.pinecone_tool import vector_store
 from app.agents.graph import compiled_graph
 from app.safety import detect_prompt_injection
+from app.ingest import read_pdf_text, parse_metadata, ingest_uploads
 from app.config import settings
 import uuid
 import io
-import json
-from typing import Optional
-from pypdf import PdfReader
+from typing import Optional, List
 
 app = FastAPI(title="Multi-Agent Research Assistant", version="0.1.0")
 
@@ -34,31 +33,25 @@ async def ingest(
     # Multipart PDF upload with optional metadata
     try:
         content = await file.read()
-        reader = PdfReader(io.BytesIO(content))
-        pages_text = []
-        for p in reader.pages:
-            try:
-                pages_text.append(p.extract_text() or "")
-            except Exception:
-                pages_text.append("")
-        full_text = "\n\n".join(pages_text)
+        full_text = read_pdf_text(io.BytesIO(content))
     except Exception:
         raise HTTPException(status_code=400, detail="Failed to read PDF file")
 
-    meta_obj = {}
-    if metadata:
-        try:
-            meta_obj = json.loads(metadata)
-            if not isinstance(meta_obj, dict):
-                meta_obj = {"meta": metadata}
-        except Exception:
-            meta_obj = {"meta": metadata}
+    meta_obj = parse_metadata(metadata)
 
     doc_id = os.path.splitext(file.filename or "")[0] or str(uuid.uuid4())
     docs = [{"id": doc_id, "text": full_text, "metadata": meta_obj}]
     vector_store.upsert_documents(docs)
     return {"status": "ingested", "count": 1, "mode": "pdf", "doc_id": doc_id}
 
+@app.post("/api/ingest/bulk")
+def ingest_bulk(
+    files: List[UploadFile] = File(...),
+    metadata: Optional[str] = Form(None),
+):
+    # Multiple PDFs and/or zip/tar archives of PDFs, embedded and upserted in pooled batches
+    return ingest_uploads(files, parse_metadata(metadata), vector_store)
+
 @app.post("/api/research", response_model=ResearchResponse)
 async def research(req: ResearchRequest):
     if detect_prompt_injection(req.query):
@@ -1,5 +1,5 @@
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Tuple
 from pinecone import Pinecone, ServerlessSpec
 from app.config import settings
 import google.generativeai as genai
@@ -109,6 +109,18 @@ class VectorStore:
                 start = 0
         return chunks
 
+    def _chunk_item(self, doc_id: str, idx: int, chunk: str, vec: List[float], base_meta: Dict[str, Any]) -> Dict[str, Any]:
+        meta = dict(base_meta)
+        meta["source_id"] = doc_id
+        meta["chunk"] = idx
+        # Persist the actual chunk text so it can be retrieved as RAG context
+        meta["text"] = chunk
+        return {
+            "id": f"{doc_id}::{idx}",
+            "values": vec,
+            "metadata": meta,
+        }
+
     def upsert_documents(self, docs: List[Dict[str, Any]]):
         # Chunk each document, embed chunks, upsert per-chunk
         items: List[Dict[str, Any]] = []
@@ -122,24 +134,145 @@ class VectorStore:
                 continue
             vectors = self.embed_texts(chunks)
             for idx, vec in enumerate(vectors):
-                cid = f"{doc_id}::{idx}"
-                meta = dict(base_meta)
-                meta["source_id"] = doc_id
-                meta["chunk"] = idx
-                # Persist the actual chunk text so it can be retrieved as RAG context
-                meta["text"] = chunks[idx]
-                item = {
-                    "id": cid,
-                    "values": vec,
-                    "metadata": meta,
-                }
-                items.append(item)
+                items.append(self._chunk_item(doc_id, idx, chunks[idx], vec, base_meta))
+        if self.index is None:
+            return
+        try:
+            self.index.upsert(vectors=items)
+        except Exception:
+            return
+
+    def upsert_documents_pooled(
+        self,
+        docs: Iterable[Dict[str, Any]],
+        embed_batch_size: int = 64,
+        upsert_batch_size: int = 100,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Bulk variant of upsert_documents for many documents.
+        Chunks from consecutive documents are pooled so every embedding call and
+        Pinecone upsert is a full-size batch. docs may be a generator; only the
+        current batches are held in memory. Document ids must be unique.
+        Returns per-document outcomes: {doc_id: {"status", "chunks", "stored", "error"?}}.
+        A document that fails after some of its chunks were upserted has those
+        chunks deleted again; if that delete fails it is reported as "partial".
+        """
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        # (doc_id, chunk index, chunk text, base metadata) waiting to be embedded
+        pending_chunks: List[Tuple[str, int, str, Dict[str, Any]]] = []
+        pending_items: List[Dict[str, Any]] = []
+
+        for d in docs:
+            doc_id = d["id"]
+            base_meta = d.get("metadata", {}) or {}
+            chunks = self._chunk_text(d.get("text", ""))
+            outcomes[doc_id] = {"status": "ingested", "chunks": len(chunks), "stored": 0}
+            if not chunks:
+                outcomes[doc_id]["status"] = "empty"
+                continue
+            for idx, chunk in enumerate(chunks):
+                pending_chunks.append((doc_id, idx, chunk, base_meta))
+            while len(pending_chunks) >= embed_batch_size:
+                batch = pending_chunks[:embed_batch_size]
+                pending_chunks = pending_chunks[embed_batch_size:]
+                pending_items.extend(self._embed_pooled(batch, outcomes))
+            while len(pending_items) >= upsert_batch_size:
+                self._upsert_pooled(pending_items[:upsert_batch_size], outcomes)
+                pending_items = pending_items[upsert_batch_size:]
+
+        if pending_chunks:
+            pending_items.extend(self._embed_pooled(pending_chunks, outcomes))
+        for start in range(0, len(pending_items), upsert_batch_size):
+            self._upsert_pooled(pending_items[start:start + upsert_batch_size], outcomes)
+        return outcomes
+
+    def _mark_failed(self, doc_ids: Iterable[str], outcomes: Dict[str, Dict[str, Any]], error: str):
+        for doc_id in doc_ids:
+            outcome = outcomes[doc_id]
+            outcome["status"] = "failed"
+            outcome["error"] = error
+            stored = outcome["stored"]
+            if stored == 0 or self.index is None:
+                continue
+            # Chunks are upserted in order, so what is stored is doc_id::0..stored-1
+            try:
+                self.index.delete(ids=[f"{doc_id}::{idx}" for idx in range(stored)])
+                outcome["stored"] = 0
+            except Exception:
+                outcome["status"] = "partial"
+
+    def _embed_pooled(
+        self,
+        batch: List[Tuple[str, int, str, Dict[str, Any]]],
+        outcomes: Dict[str, Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        try:
+            vectors = self.embed_texts([chunk for _, _, chunk, _ in batch])
+        except Exception:
+            return self._embed_per_document(batch, outcomes)
+        items = []
+        for (doc_id, idx, chunk, base_meta), vec in zip(batch, vectors):
+            # Skip the rest of a document whose earlier batch already failed
+            if outcomes[doc_id]["status"] in ("failed", "partial"):
+                continue
+            items.append(self._chunk_item(doc_id, idx, chunk, vec, base_meta))
+        return items
+
+    def _embed_per_document(
+        self,
+        batch: List[Tuple[str, int, str, Dict[str, Any]]],
+        outcomes: Dict[str, Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        # A pooled batch failed: retry each document's share so one bad document
+        # does not fail the others that happened to share its batch
+        by_doc: Dict[str, List[Tuple[str, int, str, Dict[str, Any]]]] = {}
+        for entry in batch:
+            by_doc.setdefault(entry[0], []).append(entry)
+        items = []
+        for doc_id, entries in by_doc.items():
+            if outcomes[doc_id]["status"] in ("failed", "partial"):
+                continue
+            try:
+                vectors = self.embed_texts([chunk for _, _, chunk, _ in entries])
+            except Exception as e:
+                self._mark_failed([doc_id], outcomes, str(e))
+                continue
+            for (_, idx, chunk, base_meta), vec in zip(entries, vectors):
+                items.append(self._chunk_item(doc_id, idx, chunk, vec, base_meta))
+        return items
+
+    def _upsert_pooled(self, items: List[Dict[str, Any]], outcomes: Dict[str, Dict[str, Any]]):
+        # Drop chunks of documents that failed after these items were embedded
+        items = [
+            item for item in items
+            if outcomes[item["metadata"]["source_id"]]["status"] not in ("failed", "partial")
+        ]
+        if not items:
+            return
         if self.index is None:
+            doc_ids = {item["metadata"]["source_id"] for item in items}
+            self._mark_failed(doc_ids, outcomes, "Pinecone index unavailable")
             return
         try:
             self.index.upsert(vectors=items)
         except Exception:
+            self._upsert_per_document(items, outcomes)
             return
+        for item in items:
+            outcomes[item["metadata"]["source_id"]]["stored"] += 1
+
+    def _upsert_per_document(self, items: List[Dict[str, Any]], outcomes: Dict[str, Dict[str, Any]]):
+        # A pooled upsert failed: retry each document's share, as _embed_per_document does
+        by_doc: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            by_doc.setdefault(item["metadata"]["source_id"], []).append(item)
+        for doc_id, doc_items in by_doc.items():
+            try:
+                self.index.upsert(vectors=doc_items)
+            except Exception as e:
+                self._mark_failed([doc_id], outcomes, f"Pinecone upsert failed: {e}")
+                continue
+            outcomes[doc_id]["stored"] += len(doc_items)
 
     def similarity_search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         qvecs = self.embed_texts([query])
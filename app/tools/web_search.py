@@ -1,9 +1,238 @@
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional
 from app.config import settings
+import codecs
+import re
 import httpx
 from bs4 import BeautifulSoup
+from html import unescape
+from html.parser import HTMLParser
 from urllib.parse import urlparse, parse_qs, unquote
 
+# Content types that are parsed as HTML; text/plain is passed through as-is
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+TEXT_CONTENT_TYPES = HTML_CONTENT_TYPES + ("text/plain",)
+
+# Elements whose whole subtree is dropped: non-content and page chrome
+BOILERPLATE_TAGS = {
+    "script", "style", "template", "svg",
+    "nav", "header", "footer", "aside",
+}
+# Raw-text elements: their content is never page text, even if left unclosed
+RAW_TEXT_TAGS = {"script", "style"}
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search"}
+# Whole words in an id/class (split on whitespace, "-" and "_") that mark a banner
+BOILERPLATE_MARKERS = {"cookie", "cookies", "consent", "gdpr"}
+# id/class/role markers only apply to containers; consent managers also tag
+# <body>, <p>, <li>, ... (e.g. <body class="cookie-consent-accepted">)
+MARKER_TAGS = {"div", "section", "aside", "dialog", "form"}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+# Elements whose end tag may be omitted, and the start tags that implicitly close them
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dialog", "div", "dl", "fieldset",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main",
+    "nav", "ol", "p", "pre", "section", "table", "ul",
+}
+IMPLIED_END = {
+    "p": BLOCK_TAGS,
+    "li": {"li"},
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+    "td": {"td", "th", "tr"},
+    "th": {"td", "th", "tr"},
+    "tr": {"tr"},
+    "option": {"option"},
+}
+OPTIONAL_END_TAGS = set(IMPLIED_END) | {"html", "head", "body", "tbody", "thead"}
+
+
+class MainTextParser(HTMLParser):
+    """
+    Incremental HTML-to-text parser. Text is collected as it is fed instead of
+    building a document tree, and boilerplate subtrees (nav, header, footer,
+    aside, cookie banners, scripts) are skipped entirely.
+    A stack of open elements tracks where a skipped subtree ends. If it is never
+    closed by its own end tag (unbalanced markup), its text is kept after all.
+    Call drain() after each feed() to take the fragments found so far.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._pending: List[str] = []
+        self._text: List[str] = []
+        self._stack: List[str] = []
+        # Stack index of the skipped element, and its text held back until we know
+        # it was properly closed (None: drop it regardless)
+        self._skip_at: Optional[int] = None
+        self._held: Optional[List[str]] = None
+
+    def _is_boilerplate(self, tag: str, attrs) -> bool:
+        if tag in BOILERPLATE_TAGS:
+            return True
+        if tag not in MARKER_TAGS:
+            return False
+        for name, value in attrs:
+            if not value:
+                continue
+            value = value.lower()
+            if name == "role" and value in BOILERPLATE_ROLES:
+                return True
+            if name in ("id", "class"):
+                for word in re.split(r"[\s_-]+", value):
+                    if word in BOILERPLATE_MARKERS:
+                        return True
+        return False
+
+    def _flush(self):
+        # A text node can arrive split across feed() calls; only emit it at a tag boundary
+        if self._text:
+            text = " ".join("".join(self._text).split())
+            self._text = []
+            if not text:
+                return
+            if self._skip_at is None:
+                self._pending.append(text)
+            elif self._held is not None:
+                self._held.append(text)
+
+    def _pop(self, closed: bool):
+        tag = self._stack.pop()
+        if self._skip_at != len(self._stack):
+            return
+        # An element that is legitimately left open counts as closed
+        if not closed and tag not in OPTIONAL_END_TAGS and self._held:
+            self._pending.extend(self._held)
+        self._skip_at = None
+        self._held = None
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in VOID_TAGS:
+            return
+        while self._stack and tag in IMPLIED_END.get(self._stack[-1], ()):
+            self._pop(closed=True)
+        self._stack.append(tag)
+        if self._skip_at is None and self._is_boilerplate(tag, attrs):
+            self._skip_at = len(self._stack) - 1
+            self._held = None if tag in RAW_TEXT_TAGS else []
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags (<br/>, <img/>) never open a subtree
+        self._flush()
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag not in self._stack:
+            return
+        # Close everything up to the matching element; anything above it was left open
+        while self._stack[-1] != tag:
+            self._pop(closed=False)
+        self._pop(closed=True)
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def _finish(self):
+        self._flush()
+        while self._stack:
+            self._pop(closed=False)
+
+    def close(self):
+        super().close()
+        self._finish()
+
+    def abandon(self):
+        """
+        Finish a body that was cut off mid-stream: keep the text parsed so far
+        but drop any unfinished tag or entity instead of emitting it as text.
+        """
+        rest = self.rawdata
+        self.rawdata = ""
+        # What is left is either an unfinished tag, or a text run held back
+        # because it ends in a possibly unfinished entity
+        if rest and not rest.startswith("<"):
+            amp = rest.rfind("&")
+            if amp >= 0:
+                rest = rest[:amp]
+            self.handle_data(unescape(rest))
+        self._finish()
+
+    def drain(self) -> List[str]:
+        out = self._pending
+        self._pending = []
+        return out
+
+
+def extract_main_text(
+    chunks: Iterable[bytes],
+    encoding: str = "utf-8",
+    max_bytes: int = 1048576,
+    max_chars: int = 4000,
+    content_type: str = "text/html",
+) -> Iterator[str]:
+    """
+    Stream text fragments out of raw HTML byte chunks.
+    Stops consuming chunks once max_bytes have been read or max_chars of text
+    have been emitted, so callers can abandon the rest of the download.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parser = MainTextParser() if content_type in HTML_CONTENT_TYPES else None
+
+    def fragments() -> Iterator[str]:
+        read_bytes = 0
+        truncated = False
+        carry = ""
+        for chunk in chunks:
+            if not chunk:
+                continue
+            chunk = chunk[: max_bytes - read_bytes]
+            read_bytes += len(chunk)
+            text = decoder.decode(chunk)
+            if parser is None:
+                # Hold back a trailing partial word until the next chunk
+                text = carry + text
+                words = text.split()
+                carry = ""
+                if words and not text[-1].isspace():
+                    carry = words.pop()
+                yield from words
+            else:
+                parser.feed(text)
+                yield from parser.drain()
+            if read_bytes >= max_bytes:
+                truncated = True
+                break
+        if truncated:
+            # A multibyte character split by the cut is dropped, not replaced
+            if parser is None:
+                yield from carry.split()
+            else:
+                parser.abandon()
+                yield from parser.drain()
+            return
+        tail = decoder.decode(b"", final=True)
+        if parser is None:
+            yield from (carry + tail).split()
+        else:
+            parser.feed(tail)
+            parser.close()
+            yield from parser.drain()
+
+    emitted = 0
+    for fragment in fragments():
+        if emitted >= max_chars:
+            return
+        fragment = fragment[: max_chars - emitted]
+        # Account for the joining space between fragments
+        emitted += len(fragment) + 1
+        yield fragment
+
+
 class WebSearchTool:
     def __init__(self):
         self.allowlisted = settings.allowlisted_domains
@@ -101,21 +330,35 @@ class WebSearchTool:
             return cleaned
         return cleaned
 
-    def fetch_page_text(self, url: str) -> str:
+    def iter_page_text(self, url: str) -> Iterator[str]:
+        """
+        Stream main-content text fragments from a page.
+        The body is downloaded in chunks and the connection is dropped as soon as
+        settings.fetch_max_bytes or settings.fetch_max_chars is reached.
+        Non-text responses (PDFs, images, ...) yield nothing.
+        """
         if self.is_allowed_domain(url) is False:
-            return ""
-        try:
-            with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-                resp = client.get(url)
+            return
+        with httpx.Client(timeout=10.0, follow_redirects=True) as client:
+            with client.stream("GET", url) as resp:
                 if resp.status_code != 200:
-                    return ""
-                soup = BeautifulSoup(resp.text, "html.parser")
-                for tag in soup(['script', 'style']):
-                    tag.decompose()
-                texts = []
-                for s in soup.stripped_strings:
-                    texts.append(s)
-                return " ".join(texts)
+                    return
+                raw_type = resp.headers.get("content-type", "text/html")
+                content_type = raw_type.split(";")[0].strip().lower() or "text/html"
+                if content_type not in TEXT_CONTENT_TYPES:
+                    return
+                encoding = resp.charset_encoding or "utf-8"
+                yield from extract_main_text(
+                    resp.iter_bytes(),
+                    encoding=encoding,
+                    max_bytes=settings.fetch_max_bytes,
+                    max_chars=settings.fetch_max_chars,
+                    content_type=content_type,
+                )
+
+    def fetch_page_text(self, url: str) -> str:
+        try:
+            return " ".join(self.iter_page_text(url))
         except Exception:
             return ""
 
@@ -0,0 +1,92 @@
+"""
+Compare the legacy BeautifulSoup page-text extraction with the streaming
+extractor used by WebSearchTool.fetch_page_text.
+
+Usage:
+    python -m benchmarks.bench_page_text path/to/saved_pages [--repeat 5]
+
+The corpus is any directory of saved pages (*.html / *.htm), e.g. created with
+`curl -o page.html <url>`. Pages are fed in 64 KiB chunks to mimic a streamed
+HTTP body, with the same byte/char limits as the live fetcher.
+"""
+import argparse
+import glob
+import os
+import time
+from typing import List
+
+from bs4 import BeautifulSoup
+
+from app.config import settings
+from app.tools.web_search import extract_main_text
+
+CHUNK_SIZE = 64 * 1024
+
+
+def legacy_extract(raw: bytes) -> str:
+    # Previous fetch_page_text body: full tree, every string, no limits
+    soup = BeautifulSoup(raw.decode("utf-8", errors="replace"), "html.parser")
+    for tag in soup(['script', 'style']):
+        tag.decompose()
+    texts = []
+    for s in soup.stripped_strings:
+        texts.append(s)
+    return " ".join(texts)
+
+
+def streaming_extract(raw: bytes) -> str:
+    chunks = (raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE))
+    return " ".join(
+        extract_main_text(
+            chunks,
+            max_bytes=settings.fetch_max_bytes,
+            max_chars=settings.fetch_max_chars,
+        )
+    )
+
+
+def load_corpus(path: str) -> List[bytes]:
+    pages = []
+    for pattern in ("*.html", "*.htm"):
+        for name in sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True)):
+            with open(name, "rb") as f:
+                pages.append(f.read())
+    return pages
+
+
+def run(name: str, fn, pages: List[bytes], repeat: int):
+    best = None
+    chars = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chars = 0
+        for raw in pages:
+            chars += len(fn(raw))
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    per_page = best / len(pages) * 1000
+    print(f"{name:<10} total={best:.3f}s  per_page={per_page:.2f}ms  chars={chars}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory of saved HTML pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        raise SystemExit(f"No *.html/*.htm files found in {args.corpus}")
+    total_mb = sum(len(p) for p in pages) / (1024 * 1024)
+    print(f"{len(pages)} pages, {total_mb:.1f} MiB, "
+          f"max_bytes={settings.fetch_max_bytes} max_chars={settings.fetch_max_chars}")
+
+    legacy = run("legacy", legacy_extract, pages, args.repeat)
+    streaming = run("streaming", streaming_extract, pages, args.repeat)
+    print(f"speedup    {legacy / streaming:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
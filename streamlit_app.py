@@ -4,6 +4,10 @@ import streamlit as st
 import httpx
 
 API_BASE = os.getenv("API_BASE", "http://localhost:8000")
+# Bulk ingest of large archives can take a while; seconds to wait for the response
+BULK_INGEST_TIMEOUT = float(os.getenv("BULK_INGEST_TIMEOUT", "1800"))
+# Must match SUPPORTED_SUFFIXES in app/ingest.py
+SUPPORTED_SUFFIXES = (".pdf", ".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
 
 st.set_page_config(page_title="Multi-Agent Research Assistant", layout="wide")
 
@@ -15,11 +19,19 @@ with st.sidebar:
     st.markdown("Use the backend's base URL, e.g., http://localhost:8000")
 
 st.header("Ingest Documents (RAG)")
-up_file = st.file_uploader("Upload PDF", type=["pdf"])
+up_files = st.file_uploader(
+    "Upload PDFs or zip/tar archives of PDFs (.zip, .tar, .tar.gz, .tgz, .tar.bz2, .tar.xz)",
+    # The uploader filters on the last extension only; full suffixes are checked below
+    type=["pdf", "zip", "tar", "gz", "tgz", "bz2", "xz"],
+    accept_multiple_files=True,
+)
 meta_raw = st.text_area("Optional Metadata (JSON)", value="{}")
-if st.button("Ingest PDF"):
-    if up_file is None:
-        st.warning("Please upload a PDF file.")
+if st.button("Ingest"):
+    unsupported = [f.name for f in (up_files or []) if not f.name.lower().endswith(SUPPORTED_SUFFIXES)]
+    if not up_files:
+        st.warning("Please upload a PDF file or archive.")
+    elif unsupported:
+        st.error("Unsupported file type: " + ", ".join(unsupported) + ". Expected " + ", ".join(SUPPORTED_SUFFIXES))
     else:
         try:
             # Validate metadata JSON but send original string
@@ -27,16 +39,34 @@ if st.button("Ingest PDF"):
         except Exception:
             st.error("Invalid metadata JSON")
         else:
-            with st.spinner("Uploading and ingesting PDF..."):
+            with st.spinner("Uploading and ingesting..."):
                 try:
-                    content = up_file.read()
-                    files = {"file": (up_file.name, content, "application/pdf")}
                     data = {"metadata": meta_raw or "{}"}
-                    resp = httpx.post(f"{api_base}/api/ingest", files=files, data=data, timeout=120)
-                    if resp.status_code == 200:
-                        st.success(resp.json())
+                    single_pdf = len(up_files) == 1 and up_files[0].name.lower().endswith(".pdf")
+                    if single_pdf:
+                        # Pass the file object so httpx streams it instead of copying the bytes
+                        files = {"file": (up_files[0].name, up_files[0], "application/pdf")}
+                        resp = httpx.post(f"{api_base}/api/ingest", files=files, data=data, timeout=120)
                     else:
+                        files = []
+                        for f in up_files:
+                            files.append(("files", (f.name, f, f.type or "application/octet-stream")))
+                        resp = httpx.post(f"{api_base}/api/ingest/bulk", files=files, data=data, timeout=httpx.Timeout(BULK_INGEST_TIMEOUT, connect=10.0))
+                    if resp.status_code != 200:
                         st.error(resp.text)
+                    elif single_pdf:
+                        st.success(resp.json())
+                    else:
+                        result = resp.json()
+                        st.success(
+                            f"Ingested {result.get('count', 0)} documents "
+                            f"({result.get('failed', 0)} failed) at {result.get('docs_per_sec', 0)} docs/sec"
+                        )
+                        with st.expander("Per-document results"):
+                            for d in result.get("documents", []):
+                                st.write(d)
+                except httpx.TimeoutException:
+                    st.error(f"Ingest request timed out (limit {BULK_INGEST_TIMEOUT:.0f}s for bulk uploads)")
                 except Exception as e:
                     st.error(str(e))
 
@@ -0,0 +1,44 @@
+import pytest
+
+from app.tools.pinecone_tool import vector_store
+
+
+class StubIndex:
+    def __init__(self, fail_on=None):
+        # Any upsert batch containing a vector id starting with fail_on raises
+        self.fail_on = fail_on
+        self.upserts = []
+        self.deleted = []
+
+    def upsert(self, vectors):
+        ids = [v["id"] for v in vectors]
+        if self.fail_on and any(i.startswith(self.fail_on) for i in ids):
+            raise RuntimeError("upsert rejected")
+        self.upserts.append(ids)
+
+    def delete(self, ids):
+        self.deleted.extend(ids)
+
+    def stored_ids(self):
+        return {i for batch in self.upserts for i in batch} - set(self.deleted)
+
+
+@pytest.fixture
+def stub_index_factory():
+    return StubIndex
+
+
+@pytest.fixture
+def store(monkeypatch):
+    calls = []
+
+    def embed_texts(texts):
+        calls.append(len(texts))
+        if any("BAD" in t for t in texts):
+            raise RuntimeError("embedding failed")
+        return [[0.0] for _ in texts]
+
+    monkeypatch.setattr(vector_store, "embed_texts", embed_texts)
+    monkeypatch.setattr(vector_store, "index", StubIndex())
+    monkeypatch.setattr(vector_store, "embed_calls", calls, raising=False)
+    return vector_store
@@ -0,0 +1,184 @@
+import gzip
+import io
+import tarfile
+import tempfile
+import zipfile
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.ingest import _spool, ingest_uploads, iter_upload_pdfs
+
+
+def make_pdf(text):
+    # Smallest valid single-page PDF with one line of text
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def upload(name, data):
+    f = tempfile.SpooledTemporaryFile()
+    f.write(data)
+    f.seek(0)
+    return UploadFile(file=f, filename=name)
+
+
+def make_zip(members, encrypted=()):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+        infos = {info.filename: info for info in zf.infolist()}
+    data = bytearray(buf.getvalue())
+    # Flag members as encrypted in both the local and the central directory header
+    central = data.find(b"PK\x01\x02")
+    for name in encrypted:
+        data[infos[name].header_offset + 6] |= 0x1
+        entry = data.find(b"PK\x01\x02", central)
+        while data[entry + 46:entry + 46 + len(name)] != name.encode():
+            entry = data.find(b"PK\x01\x02", entry + 1)
+        data[entry + 8] |= 0x1
+    return bytes(data)
+
+
+def make_tar(members, mode="w:gz"):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as tf:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def by_name(report):
+    return {d["name"]: d for d in report["documents"]}
+
+
+def test_zip_upload(store):
+    data = make_zip({"a.pdf": make_pdf("alpha"), "dir/b.pdf": make_pdf("beta"), "notes.txt": b"skip"})
+    report = ingest_uploads([upload("docs.zip", data)], {"source": "t"}, store)
+    assert report["count"] == 2
+    assert report["failed"] == 0
+    docs = by_name(report)
+    assert set(docs) == {"a.pdf", "dir/b.pdf"}
+    assert docs["dir/b.pdf"]["doc_id"] == "dir/b"
+    assert docs["a.pdf"]["status"] == "ingested"
+    assert docs["a.pdf"]["source"] == "docs.zip"
+    assert store.index.stored_ids() == {"a::0", "dir/b::0"}
+
+
+def test_tar_upload(store):
+    data = make_tar({"x.pdf": make_pdf("x"), "y.PDF": make_pdf("y")})
+    report = ingest_uploads([upload("docs.tar.gz", data)], {}, store)
+    assert report["count"] == 2
+    assert {d["doc_id"] for d in report["documents"]} == {"x", "y"}
+
+
+def test_mixed_upload_with_duplicate_names(store):
+    uploads = [
+        upload("report.pdf", make_pdf("top level")),
+        upload("one.zip", make_zip({"report.pdf": make_pdf("from zip")})),
+        upload("two.tar", make_tar({"report.pdf": make_pdf("from tar")}, mode="w")),
+    ]
+    report = ingest_uploads(uploads, {}, store)
+    assert report["count"] == 3
+    assert [d["doc_id"] for d in report["documents"]] == ["report", "report-2", "report-3"]
+    assert [d["source"] for d in report["documents"]] == ["report.pdf", "one.zip", "two.tar"]
+    assert store.index.stored_ids() == {"report::0", "report-2::0", "report-3::0"}
+
+
+def test_unreadable_pdf_and_encrypted_member(store):
+    data = make_zip(
+        {"ok.pdf": make_pdf("fine"), "locked.pdf": make_pdf("secret"), "junk.pdf": b"not a pdf"},
+        encrypted={"locked.pdf"},
+    )
+    report = ingest_uploads([upload("docs.zip", data)], {}, store)
+    docs = by_name(report)
+    assert docs["ok.pdf"]["status"] == "ingested"
+    assert docs["locked.pdf"]["status"] == "failed"
+    assert "archive member" in docs["locked.pdf"]["error"]
+    assert docs["junk.pdf"]["status"] == "failed"
+    assert report["count"] == 1
+    assert report["failed"] == 2
+
+
+def test_truncated_tar_keeps_earlier_members(store):
+    first = make_pdf("first")
+    data = make_tar({"first.pdf": first, "second.pdf": make_pdf("second") * 50})
+    raw = gzip.decompress(data)
+    # Cut inside the second member, after the first is complete
+    cut = gzip.compress(raw[: 512 + len(first) + 512 + 1000])
+    report = ingest_uploads([upload("docs.tgz", cut), upload("c.pdf", make_pdf("c"))], {}, store)
+    statuses = [(d["name"], d["status"]) for d in report["documents"]]
+    assert statuses[0] == ("first.pdf", "ingested")
+    assert statuses[-1] == ("c.pdf", "ingested")
+    assert any(status == "failed" for _, status in statuses[1:-1])
+
+
+def test_corrupt_archive_is_reported(store):
+    report = ingest_uploads([upload("broken.zip", b"not a zip")], {}, store)
+    assert report["count"] == 0
+    assert report["documents"][0]["status"] == "failed"
+    assert report["documents"][0]["source"] == "broken.zip"
+
+
+def test_unsupported_extension_is_rejected(store):
+    report = ingest_uploads([upload("foo.gz", gzip.compress(make_pdf("x")))], {}, store)
+    doc = report["documents"][0]
+    assert doc["status"] == "failed"
+    assert doc["error"].startswith("Unsupported file type")
+
+
+def test_members_are_spooled_and_seekable():
+    data = make_zip({"a.pdf": make_pdf("alpha")})
+    [(name, stream, error)] = list(iter_upload_pdfs(upload("docs.zip", data)))
+    assert error is None
+    assert not isinstance(stream, zipfile.ZipExtFile)
+    stream.seek(0, 2)
+    stream.seek(0)
+    assert stream.read(5) == b"%PDF-"
+
+
+def test_oversized_member_is_rejected(store, monkeypatch):
+    monkeypatch.setattr(settings, "ingest_max_member_bytes", 2000)
+    data = make_zip({"small.pdf": make_pdf("ok"), "big.pdf": make_pdf("big") + b"\n%" + b"x" * 5000})
+    docs = by_name(ingest_uploads([upload("docs.zip", data)], {}, store))
+    assert docs["small.pdf"]["status"] == "ingested"
+    assert docs["big.pdf"]["status"] == "failed"
+    assert "larger than 2000 bytes" in docs["big.pdf"]["error"]
+
+
+def test_spool_stops_at_limit_despite_header_size(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_max_member_bytes", 100)
+    with pytest.raises(ValueError, match="larger than 100 bytes"):
+        _spool(io.BytesIO(b"x" * 1000))
+
+
+def test_member_count_limit(store, monkeypatch):
+    monkeypatch.setattr(settings, "ingest_max_members", 2)
+    data = make_tar({f"{i}.pdf": make_pdf(str(i)) for i in range(4)})
+    report = ingest_uploads([upload("docs.tar.gz", data)], {}, store)
+    assert report["count"] == 2
+    assert report["failed"] == 1
+    assert "more than 2 PDF members" in report["documents"][-1]["error"]
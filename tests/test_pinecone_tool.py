@@ -0,0 +1,79 @@
+def doc(doc_id, n_chunks, marker="x"):
+    # _chunk_text uses 800-char chunks with 200 overlap: 800 + 600 * (n - 1) chars
+    return {"id": doc_id, "text": marker * (800 + 600 * (n_chunks - 1))}
+
+
+def test_batches_are_full_across_documents(store):
+    docs = (doc(f"d{i}", 3) for i in range(50))
+    outcomes = store.upsert_documents_pooled(docs, embed_batch_size=64, upsert_batch_size=100)
+    assert store.embed_calls == [64, 64, 22]
+    assert [len(b) for b in store.index.upserts] == [100, 50]
+    assert all(o == {"status": "ingested", "chunks": 3, "stored": 3} for o in outcomes.values())
+
+
+def test_empty_document(store):
+    outcomes = store.upsert_documents_pooled([{"id": "e", "text": ""}])
+    assert outcomes["e"]["status"] == "empty"
+    assert store.index.upserts == []
+
+
+def test_bad_document_fails_alone(store):
+    docs = [doc("a", 1), {"id": "b", "text": "BAD"}, doc("c", 1)]
+    outcomes = store.upsert_documents_pooled(docs, embed_batch_size=2)
+    assert outcomes["a"]["status"] == "ingested"
+    assert outcomes["b"]["status"] == "failed"
+    assert outcomes["b"]["error"] == "embedding failed"
+    assert outcomes["c"]["status"] == "ingested"
+    assert store.index.stored_ids() == {"a::0", "c::0"}
+
+
+def test_upsert_failure_fails_only_that_document(store, stub_index_factory):
+    store.index = stub_index_factory(fail_on="b::")
+    docs = [doc("a", 2), doc("b", 2), doc("c", 2)]
+    outcomes = store.upsert_documents_pooled(docs, embed_batch_size=2, upsert_batch_size=2)
+    assert outcomes["a"]["status"] == "ingested"
+    assert outcomes["b"]["status"] == "failed"
+    assert outcomes["b"]["stored"] == 0
+    assert outcomes["c"]["status"] == "ingested"
+    assert store.index.stored_ids() == {"a::0", "a::1", "c::0", "c::1"}
+
+
+def test_upsert_failure_in_mixed_batch_retries_per_document(store, stub_index_factory):
+    store.index = stub_index_factory(fail_on="d3::")
+    docs = [doc(f"d{i}", 4) for i in range(10)]
+    outcomes = store.upsert_documents_pooled(docs, embed_batch_size=64, upsert_batch_size=100)
+    failed = {doc_id for doc_id, o in outcomes.items() if o["status"] != "ingested"}
+    assert failed == {"d3"}
+    assert outcomes["d3"]["stored"] == 0
+    assert all(outcomes[f"d{i}"]["stored"] == 4 for i in range(10) if i != 3)
+    assert len(store.index.stored_ids()) == 36
+    assert store.index.deleted == []
+
+
+def test_failed_document_chunks_already_upserted_are_deleted(store, stub_index_factory):
+    # "b" spans two upsert batches; the second one fails
+    store.index = stub_index_factory(fail_on="b::2")
+    docs = [doc("b", 4)]
+    outcomes = store.upsert_documents_pooled(docs, embed_batch_size=2, upsert_batch_size=2)
+    assert outcomes["b"]["status"] == "failed"
+    assert outcomes["b"]["stored"] == 0
+    assert store.index.deleted == ["b::0", "b::1"]
+    assert store.index.stored_ids() == set()
+
+
+def test_partial_when_cleanup_fails(store, stub_index_factory):
+    store.index = stub_index_factory(fail_on="b::2")
+
+    def delete(ids):
+        raise RuntimeError("delete rejected")
+
+    store.index.delete = delete
+    outcomes = store.upsert_documents_pooled([doc("b", 4)], embed_batch_size=2, upsert_batch_size=2)
+    assert outcomes["b"]["status"] == "partial"
+    assert outcomes["b"]["stored"] == 2
+
+
+def test_no_index_reports_failure(store):
+    store.index = None
+    outcomes = store.upsert_documents_pooled([doc("a", 1)])
+    assert outcomes["a"]["status"] == "failed"
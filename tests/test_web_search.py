@@ -0,0 +1,162 @@
+from app.tools.web_search import extract_main_text
+
+
+def chunked(data, size):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def extract(html, size=3, **kwargs):
+    return " ".join(extract_main_text(chunked(html, size), **kwargs))
+
+
+PAGE = (
+    "<html><head><style>p { color: red }</style><script>var a = '<p>x</p>';</script></head>"
+    "<body><header><nav><a href='/'>Home</a></nav></header>"
+    "<main><article><h1>Title &amp; more</h1><p>First paragraph.</p>"
+    "<p>Second<br/>line</p><img src='a.png'></article></main>"
+    "<aside>Related</aside><footer>Copyright</footer></body></html>"
+)
+
+
+def test_strips_boilerplate_and_scripts():
+    assert extract(PAGE) == "Title & more First paragraph. Second line"
+
+
+def test_output_independent_of_chunk_size():
+    expected = extract(PAGE, size=len(PAGE))
+    for size in (1, 2, 5, 17):
+        assert extract(PAGE, size=size) == expected
+
+
+def test_text_node_split_across_chunks_is_not_broken():
+    assert extract("<p>Hello world</p>", size=1) == "Hello world"
+
+
+def test_nested_same_name_boilerplate():
+    html = "<aside><aside>inner</aside>still aside</aside><p>content</p>"
+    assert extract(html) == "content"
+
+
+def test_cookie_banner_is_skipped():
+    html = (
+        "<div class='cookie-banner'><div>We use <b>cookies</b></div><p>Accept</p></div>"
+        "<div id='gdpr_notice'>Consent</div><p>content</p>"
+    )
+    assert extract(html) == "content"
+
+
+def test_marker_matches_whole_words_only():
+    assert extract("<div class='nocookie-here'><p>content</p></div>") == "content"
+    assert extract("<div class='consentino'><p>content</p></div>") == "content"
+
+
+def test_wrapper_with_consent_class_is_kept():
+    html = "<html class='gdpr'><body class='cookie-consent-accepted'><main><p>Hello world</p></main></body></html>"
+    assert extract(html) == "Hello world"
+
+
+def test_page_wrapping_form_is_kept():
+    html = "<body><form id=aspnetForm><div><p>Article body text</p></div></form></body>"
+    assert extract(html) == "Article body text"
+
+
+def test_role_navigation_is_skipped():
+    assert extract("<div role='navigation'><a>Menu</a></div><p>content</p>") == "content"
+
+
+def test_multibyte_utf8_split_across_chunks():
+    html = "<p>café naïve 日本語 😀</p>"
+    assert extract(html, size=1) == "café naïve 日本語 😀"
+
+
+def test_declared_encoding_is_used():
+    html = "<p>café</p>".encode("latin-1")
+    assert extract(html, size=1, encoding="latin-1") == "café"
+
+
+def test_unknown_encoding_falls_back_to_utf8():
+    assert extract("<p>café</p>", encoding="no-such-codec") == "café"
+
+
+def test_max_chars_caps_output():
+    html = "<p>aaaa</p><p>bbbb</p><p>cccc</p>"
+    assert extract(html, max_chars=7) == "aaaa bb"
+
+
+def test_max_chars_stops_consuming_chunks():
+    consumed = []
+
+    def chunks():
+        for chunk in chunked("<p>aaaa</p>" * 100, 11):
+            consumed.append(chunk)
+            yield chunk
+
+    assert " ".join(extract_main_text(chunks(), max_chars=4)) == "aaaa"
+    assert len(consumed) < 100
+
+
+def test_max_bytes_drops_partial_closing_tag():
+    assert extract("<p>aaaa</p><p>bbbb</p><p>cc", max_bytes=20) == "aaaa bbbb"
+
+
+def test_max_bytes_drops_partial_open_tag():
+    assert extract("<p>aaaa</p><div class='x'>bbbb</div>", max_bytes=18) == "aaaa"
+
+
+def test_max_bytes_keeps_text_before_cut():
+    assert extract("<p>aaaa</p><p>bbbbbbbb</p>", max_bytes=17) == "aaaa bbb"
+
+
+def test_max_bytes_inside_multibyte_character():
+    # "é" is two bytes; cutting between them must not emit a replacement char
+    assert extract("<p>café</p>", size=1, max_bytes=7) == "caf"
+
+
+def test_plain_text_words_carried_across_chunks():
+    text = "hello wonderful world"
+    assert extract(text, size=2, content_type="text/plain") == text
+
+
+def test_plain_text_max_bytes():
+    assert extract("hello wonderful world", content_type="text/plain", max_bytes=8) == "hello wo"
+
+
+def test_marker_on_paragraph_is_ignored():
+    html = "<p class=cookie-note>We use cookies<p>Real article text here"
+    assert extract(html) == "We use cookies Real article text here"
+
+
+def test_marker_on_list_item_is_ignored():
+    html = "<ul><li class=gdpr>x<li>item two</ul><p>content</p>"
+    assert extract(html) == "x item two content"
+
+
+def test_unclosed_banner_keeps_its_text():
+    html = "<div class=cookie><div>unclosed inner</div><p>content</p>"
+    assert extract(html) == "unclosed inner content"
+
+
+def test_banner_closed_by_ancestor_keeps_its_text():
+    html = "<body><section><div class=cookie>banner<p>content</section><p>after</p></body>"
+    assert extract(html) == "banner content after"
+
+
+def test_closed_banner_with_unclosed_children_is_skipped():
+    html = "<div class=cookie><p>We use cookies<ul><li>a<li>b</ul></div><p>content"
+    assert extract(html) == "content"
+
+
+def test_unclosed_script_is_dropped():
+    assert extract("<p>content</p><script>var a = 1;") == "content"
+
+
+def test_implied_end_tags_close_boilerplate():
+    html = "<table><tr><td><nav>menu</nav>cell one<td>cell two</table><p>content</p>"
+    assert extract(html) == "cell one cell two content"
+
+
+def test_max_bytes_inside_entity_keeps_text():
+    assert extract("<p>aaaa &am", max_bytes=10) == "aaaa"
+    assert extract("<p>a &amp; b &am", max_bytes=16) == "a & b"